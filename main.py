@@ -8,13 +8,13 @@ This script manages GitHub Copilot license holders with a simple two-cost-center
 """
 
 import argparse
+import hashlib
+import json
 import logging
 import sys
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
-from src.github_api import GitHubCopilotManager
-from src.cost_center_manager import CostCenterManager
 from src.config_manager import ConfigManager
 from src.logger_setup import setup_logging
 
@@ -73,6 +73,12 @@ def parse_arguments():
         help="Skip confirmation prompt in apply mode (non-interactive)"
     )
     
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="In apply mode, push assignments even for cost centers unchanged since the last successful apply"
+    )
+    
     parser.add_argument(
         "--summary-report",
         action="store_true",
@@ -102,11 +108,18 @@ def parse_arguments():
     return parser.parse_args()
 
 
-def _show_success_summary(config: ConfigManager, args, users: Optional[List[Dict]] = None, original_user_count: Optional[int] = None, assignment_results: Optional[Dict] = None):
-    """Show a comprehensive success summary at the end of execution."""
-    print("\n" + "="*60)
-    print("🎉 SUCCESS SUMMARY")
-    print("="*60)
+def _hash_usernames(usernames: List[str]) -> str:
+    """Return an order-independent fingerprint of a cost center's member list."""
+    return hashlib.blake2b(json.dumps(sorted(usernames)).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _show_success_summary(config: ConfigManager, args, users: Optional[List[Dict]] = None, original_user_count: Optional[int] = None, assignment_results: Optional[Dict] = None, counters: Optional[Tuple[int, int]] = None):
+    """Show a comprehensive success summary at the end of execution.
+    
+    counters is the (prus_assignments, no_prus_assignments) pair tallied by the assignment loop.
+    """
+    # Collect the whole summary and write it in one go
+    lines = ["\n" + "="*60, "🎉 SUCCESS SUMMARY", "="*60]
     
     # Show what operations were completed
     operations = []
@@ -121,33 +134,32 @@ def _show_success_summary(config: ConfigManager, args, users: Optional[List[Dict
     if args.incremental:
         operations.append("🔄 Incremental processing used")
     
-    for op in operations:
-        print(f"  {op}")
+    lines.extend(f"  {op}" for op in operations)
     
     # Show cost center information with links
     if config.github_enterprise and not config.github_enterprise.startswith("REPLACE_WITH_"):
-        print(f"\n📊 COST CENTERS ({config.github_enterprise}):")
+        lines.append(f"\n📊 COST CENTERS ({config.github_enterprise}):")
         
         # No PRUs cost center
-        if not config.no_prus_cost_center.startswith("REPLACE_WITH_"):
-            no_pru_url = f"https://github.com/enterprises/{config.github_enterprise}/billing/cost_centers/{config.no_prus_cost_center}"
-            print(f"  🔵 No PRU Overages: {config.no_prus_cost_center}")
-            print(f"     → {no_pru_url}")
+        no_pru_url = config.cost_center_url(config.no_prus_cost_center)
+        if no_pru_url:
+            lines.append(f"  🔵 No PRU Overages: {config.no_prus_cost_center}")
+            lines.append(f"     → {no_pru_url}")
         
         # PRUs allowed cost center  
-        if not config.prus_allowed_cost_center.startswith("REPLACE_WITH_"):
-            pru_url = f"https://github.com/enterprises/{config.github_enterprise}/billing/cost_centers/{config.prus_allowed_cost_center}"
-            print(f"  🟡 PRU Overages Allowed: {config.prus_allowed_cost_center}")
-            print(f"     → {pru_url}")
+        pru_url = config.cost_center_url(config.prus_allowed_cost_center)
+        if pru_url:
+            lines.append(f"  🟡 PRU Overages Allowed: {config.prus_allowed_cost_center}")
+            lines.append(f"     → {pru_url}")
     
     # Show user statistics if users were processed
     if users:
-        print(f"\n👥 USER STATISTICS:")
-        print(f"  📈 Total users processed: {len(users)}")
+        lines.append(f"\n👥 USER STATISTICS:")
+        lines.append(f"  📈 Total users processed: {len(users)}")
         
         # Show incremental processing info if applicable
         if args.incremental and original_user_count is not None:
-            print(f"  🔄 Incremental processing: {len(users)} of {original_user_count} total users")
+            lines.append(f"  🔄 Incremental processing: {len(users)} of {original_user_count} total users")
         
         # Show actual assignment results if available
         if assignment_results and args.mode == "apply" and args.assign_cost_centers:
@@ -158,18 +170,18 @@ def _show_success_summary(config: ConfigManager, args, users: Optional[List[Dict
                 total_attempted += len(user_results)
                 total_successful += successful
                 
-            print(f"  ✅ Assignment success rate: {total_successful}/{total_attempted} users")
+            lines.append(f"  ✅ Assignment success rate: {total_successful}/{total_attempted} users")
             if total_successful < total_attempted:
                 failed = total_attempted - total_successful
-                print(f"  ❌ Failed assignments: {failed} users")
-        elif args.assign_cost_centers:
+                lines.append(f"  ❌ Failed assignments: {failed} users")
+        elif args.assign_cost_centers and counters is not None:
             # Count by cost center if assignments were planned
-            no_pru_count = len([u for u in users if u.get('cost_center') == config.no_prus_cost_center])
-            pru_count = len([u for u in users if u.get('cost_center') == config.prus_allowed_cost_center])
-            print(f"  🔵 No PRU users: {no_pru_count}")
-            print(f"  🟡 PRU exception users: {pru_count}")
+            pru_count, no_pru_count = counters
+            lines.append(f"  🔵 No PRU users: {no_pru_count}")
+            lines.append(f"  🟡 PRU exception users: {pru_count}")
     
-    print("="*60)
+    lines.append("="*60)
+    print("\n".join(lines))
 
 
 def main():
@@ -182,6 +194,11 @@ def main():
     logger = logging.getLogger(__name__)
     
     try:
+        # Filled in as the run progresses; reported by the final success summary
+        users: Optional[List[Dict]] = None
+        original_user_count: Optional[int] = None
+        assignment_results: Optional[Dict] = None
+        
         # Load configuration
         config = ConfigManager(args.config)
         
@@ -194,59 +211,73 @@ def main():
         
         logger.info("Configuration loaded successfully")
         
-        # Initialize managers
-        github_manager = GitHubCopilotManager(config)
-        cost_center_manager = CostCenterManager(config, auto_create_enabled=args.create_cost_centers)
-        
         # Always show configuration at the beginning of every run
-        print("\n===== Current Configuration =====")
-        print(f"Enterprise: {config.github_enterprise}")
+        # Built up as lines and written once, since the exception list can be long
+        lines = ["\n===== Current Configuration =====", f"Enterprise: {config.github_enterprise}"]
         
         # Check if auto-creation is enabled
         auto_create_enabled = args.create_cost_centers or config.auto_create_cost_centers
         
         # Display cost centers (with auto-creation info if applicable)
         if auto_create_enabled:
-            print(f"No PRUs Cost Center: New cost center \"{config.no_pru_cost_center_name}\" to be created")
-            print(f"PRUs Allowed Cost Center: New cost center \"{config.pru_allowed_cost_center_name}\" to be created")
+            lines.append(f"No PRUs Cost Center: New cost center \"{config.no_pru_cost_center_name}\" to be created")
+            lines.append(f"PRUs Allowed Cost Center: New cost center \"{config.pru_allowed_cost_center_name}\" to be created")
         else:
             # Display normal cost center info with URLs (only if not placeholders)
-            print(f"No PRUs Cost Center: {config.no_prus_cost_center}")
-            if (config.github_enterprise and 
-                not config.github_enterprise.startswith("REPLACE_WITH_") and
-                not config.no_prus_cost_center.startswith("REPLACE_WITH_")):
-                no_prus_url = f"https://github.com/enterprises/{config.github_enterprise}/billing/cost_centers/{config.no_prus_cost_center}"
-                print(f"  → {no_prus_url}")
+            lines.append(f"No PRUs Cost Center: {config.no_prus_cost_center}")
+            no_prus_url = config.cost_center_url(config.no_prus_cost_center)
+            if no_prus_url:
+                lines.append(f"  → {no_prus_url}")
             
-            print(f"PRUs Allowed Cost Center: {config.prus_allowed_cost_center}")
-            if (config.github_enterprise and 
-                not config.github_enterprise.startswith("REPLACE_WITH_") and
-                not config.prus_allowed_cost_center.startswith("REPLACE_WITH_")):
-                prus_allowed_url = f"https://github.com/enterprises/{config.github_enterprise}/billing/cost_centers/{config.prus_allowed_cost_center}"
-                print(f"  → {prus_allowed_url}")
+            lines.append(f"PRUs Allowed Cost Center: {config.prus_allowed_cost_center}")
+            prus_allowed_url = config.cost_center_url(config.prus_allowed_cost_center)
+            if prus_allowed_url:
+                lines.append(f"  → {prus_allowed_url}")
         
-        print(f"PRUs Exception Users ({len(config.prus_exception_users)}):")
-        for user in config.prus_exception_users:
-            print(f"  - {user}")
-        print("===== End of Configuration =====\n")
+        lines.append(f"PRUs Exception Users ({len(config.prus_exception_users)}):")
+        lines.extend(f"  - {user}" for user in sorted(config.prus_exception_users, key=str))
+        lines.append("===== End of Configuration =====\n")
+        print("\n".join(lines))
         
         # Exit early if only showing config (--show-config with no other actions)
         if args.show_config and not any([args.list_users, args.assign_cost_centers, args.summary_report]):
             return
+        
+        # Imported lazily so --show-config doesn't pay for loading the HTTP stack
+        from src.github_api import GitHubCopilotManager
+        from src.cost_center_manager import CostCenterManager
+        
+        # Initialize managers
+        github_manager = GitHubCopilotManager(config)
+        cost_center_manager = CostCenterManager(config, auto_create_enabled=args.create_cost_centers)
 
             # We no longer fetch existing assignments; we always compute desired state from rules
 
             # Get Copilot users
         logger.info("Fetching Copilot license holders...")
-        users = github_manager.get_copilot_users()
-        logger.info(f"Found {len(users)} Copilot license holders")
+        # In incremental mode only users created since the last run are kept
+        last_run_timestamp = config.load_last_run_timestamp() if args.incremental else None
+        # Incremental runs reuse the seat pages from the last run via conditional (ETag) requests
+        seats_cache = config.load_seats_cache() if args.incremental else None
+        users = github_manager.iter_copilot_users(page_cache=seats_cache, since=last_run_timestamp)
+        
+        # Filter users if specified, as they stream in, so unrequested users are never kept
+        if args.users:
+            specified_users = {u.strip() for u in args.users.split(",")}
+            users = (user for user in users if user.get("login") in specified_users)
+        users = list(users)
+        
+        # Plan runs leave the state file untouched, like the last run timestamp
+        if seats_cache is not None and args.mode == "apply":
+            config.save_seats_cache(seats_cache)
+        original_user_count = github_manager.total_copilot_users
+        logger.info(f"Found {original_user_count} Copilot license holders")
+        if args.users:
+            logger.info(f"Filtered to {len(users)} specified users")
         
         # Handle incremental processing if requested
-        original_user_count = len(users)
         if args.incremental:
-            last_run_timestamp = config.load_last_run_timestamp()
             if last_run_timestamp:
-                users = github_manager.filter_users_by_timestamp(users, last_run_timestamp)
                 logger.info(f"Incremental mode: Processing {len(users)} users (of {original_user_count} total) created after {last_run_timestamp}")
                 
                 if len(users) == 0:
@@ -289,12 +320,6 @@ def main():
                     logger.error("Failed to create/find required cost centers")
                     sys.exit(1)
         
-        # Filter users if specified
-        if args.users:
-            specified_users = [u.strip() for u in args.users.split(",")]
-            users = [user for user in users if user.get("login") in specified_users]
-            logger.info(f"Filtered to {len(users)} specified users")
-        
         # List users if requested
         if args.list_users:
             print("\n=== Copilot License Holders ===")
@@ -312,34 +337,21 @@ def main():
             if args.mode == "plan":
                 logger.info("MODE=plan (no changes will be made)")
             
-            prus_assignments = 0
-            no_prus_assignments = 0
-            # We now build full desired grouping without diffing existing assignments
-            desired_groups = {
-                cost_center_manager.cost_center_prus_allowed: [],
-                cost_center_manager.cost_center_no_prus: []
-            }
-            
-            for user in users:
-                cost_center = cost_center_manager.assign_cost_center(user)
-                user["cost_center"] = cost_center
-                
-                # Count assignments
-                if cost_center == cost_center_manager.cost_center_prus_allowed:
-                    prus_assignments += 1
-                else:
-                    no_prus_assignments += 1
-                
-                username = user.get('login')
-                desired_groups[cost_center].append(username)
-                if args.mode == "plan":
-                    logger.debug(f"Would assign {username} to '{cost_center}'")
+            prus_cost_center = cost_center_manager.cost_center_prus_allowed
+            no_prus_cost_center = cost_center_manager.cost_center_no_prus
+            # We now build full desired grouping without diffing existing assignments; the
+            # manager applies the PRU rules and groups users in one pass (decisions at DEBUG)
+            desired_groups = cost_center_manager.group_users_by_cost_center(users)
+            prus_assignments = len(desired_groups[prus_cost_center])
+            no_prus_assignments = len(users) - prus_assignments
             
             # Summary of assignments
-            print(f"\n=== Assignment Summary ===")
-            print(f"PRUs Allowed ({cost_center_manager.cost_center_prus_allowed}): {prus_assignments} users")
-            print(f"No PRUs ({cost_center_manager.cost_center_no_prus}): {no_prus_assignments} users")
-            print(f"Total: {len(users)} users")
+            print("\n".join([
+                "\n=== Assignment Summary ===",
+                f"PRUs Allowed ({prus_cost_center}): {prus_assignments} users",
+                f"No PRUs ({no_prus_cost_center}): {no_prus_assignments} users",
+                f"Total: {len(users)} users",
+            ]))
             
             # Sync assignments (full desired state) if requested
             if args.assign_cost_centers:
@@ -348,24 +360,46 @@ def main():
                     for cost_center_id, usernames in desired_groups.items():
                         logger.info(f"Would add {len(usernames)} users to cost center {cost_center_id}")
                 else:  # apply
-                    # Safety confirmation unless --yes provided
-                    if not args.yes:
-                        print("\nYou are about to APPLY cost center assignments to GitHub Enterprise.")
-                        print("This will push assignments for ALL processed users (no diff).")
-                        print("Summary:")
-                        for cc_id, usernames in desired_groups.items():
-                            print(f"  - {cc_id}: {len(usernames)} users")
-                        confirm = input("\nProceed? Type 'apply' to continue: ").strip().lower()
-                        if confirm != "apply":
-                            logger.warning("Aborted by user before applying assignments")
-                            return
-                    logger.info("Applying full assignment state to GitHub Enterprise...")
                     cost_center_groups = {cc: users for cc, users in desired_groups.items() if users}
-                    if not cost_center_groups:
+                    has_users = bool(cost_center_groups)
+                    
+                    # Skip cost centers whose membership is identical to the last successful apply,
+                    # before prompting, so an unchanged population needs no confirmation or writes
+                    applied_hashes = config.load_applied_hashes()
+                    group_hashes = {cc: _hash_usernames(usernames) for cc, usernames in cost_center_groups.items()}
+                    if not args.force:
+                        for cc_id, group_hash in group_hashes.items():
+                            if applied_hashes.get(cc_id) == group_hash:
+                                logger.info(f"Cost center {cc_id}: no changes since last apply, skipping (use --force to re-apply)")
+                                del cost_center_groups[cc_id]
+                    
+                    if not has_users:
                         logger.warning("No users to sync")
+                    elif not cost_center_groups:
+                        logger.info("No changes since last apply - nothing to sync")
                     else:
+                        # Safety confirmation unless --yes provided
+                        if not args.yes:
+                            print("\nYou are about to APPLY cost center assignments to GitHub Enterprise.")
+                            print("This will push assignments for ALL processed users of these cost centers (no diff).")
+                            print("Summary:")
+                            for cc_id, usernames in cost_center_groups.items():
+                                print(f"  - {cc_id}: {len(usernames)} users")
+                            confirm = input("\nProceed? Type 'apply' to continue: ").strip().lower()
+                            if confirm != "apply":
+                                logger.warning("Aborted by user before applying assignments")
+                                return
+                        logger.info("Applying full assignment state to GitHub Enterprise...")
                         results = github_manager.bulk_update_cost_center_assignments(cost_center_groups)
                         
+                        # Remember fully successful cost centers so unchanged ones are skipped next time
+                        for cost_center_id, user_results in results.items():
+                            if all(user_results.values()):
+                                applied_hashes[cost_center_id] = group_hashes[cost_center_id]
+                            else:
+                                applied_hashes.pop(cost_center_id, None)
+                        config.save_applied_hashes(applied_hashes)
+                        
                         # Process detailed results for summary
                         total_users_attempted = 0
                         total_users_successful = 0
@@ -399,7 +433,11 @@ def main():
         # Generate summary report if requested
         if args.summary_report:
             logger.info("Generating cost center summary...")
-            summary = cost_center_manager.generate_summary(users)
+            if args.assign_cost_centers:
+                # The assignment loop already grouped every user; reuse its tallies
+                summary = {cc: len(usernames) for cc, usernames in desired_groups.items() if usernames}
+            else:
+                summary = cost_center_manager.generate_summary(users)
             
             # Print summary to console and log
             print("\n=== Cost Center Summary ===")
@@ -417,9 +455,10 @@ def main():
         _show_success_summary(
             config, 
             args, 
-            users if 'users' in locals() else None, 
+            users, 
             original_user_count if args.incremental else None,
-            assignment_results if 'assignment_results' in locals() else None
+            assignment_results,
+            (prus_assignments, no_prus_assignments) if args.assign_cost_centers else None
         )
         
         logger.info("Script execution completed successfully")
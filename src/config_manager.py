@@ -2,14 +2,143 @@
 Configuration Manager for loading and managing application settings.
 """
 
+import copy
+import hashlib
 import logging
 import os
+import tempfile
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Any, List, Optional
-from datetime import datetime
+from datetime import datetime, timezone
 import json
-import yaml
-from dotenv import load_dotenv
+
+from . import json_utils
+
+# Bump when the layout of the parsed-config cache file changes
+CONFIG_CACHE_VERSION = 2
+
+logger = logging.getLogger(__name__)
+
+# Sample values that mean "not configured yet"
+PLACEHOLDER_ENTERPRISE_VALUES = frozenset({"", None, "REPLACE_WITH_ENTERPRISE_SLUG", "your_enterprise_name"})
+PLACEHOLDER_COST_CENTER_VALUES = {
+    "no_prus_cost_center": frozenset({"REPLACE_WITH_NO_PRUS_COST_CENTER_ID", "CC-001-NO-PRUS"}),
+    "prus_allowed_cost_center": frozenset({"REPLACE_WITH_PRUS_ALLOWED_COST_CENTER_ID", "CC-002-PRUS-ALLOWED"}),
+}
+
+# Templates written by create_example_config(); fixed text, so no YAML emitter is needed
+EXAMPLE_CONFIG_YAML = """\
+cost_centers:
+  no_prus_cost_center: CC-001-NO-PRUS
+  prus_allowed_cost_center: CC-002-PRUS-ALLOWED
+export:
+  directory: exports
+  formats:
+  - csv
+  - excel
+github:
+  enterprise: your_enterprise_name
+  token: your_github_personal_access_token_here
+logging:
+  file: logs/copilot_manager.log
+  level: INFO
+"""
+
+EXAMPLE_RULES_YAML = """\
+prus_exception_users:
+- john.doe
+- jane.smith
+- admin.user
+"""
+
+
+def _yaml_safe_load(stream) -> Any:
+    """Parse YAML, importing PyYAML only when a file actually has to be parsed."""
+    import yaml
+    # libyaml-backed loader is several times faster; PyYAML may be built without it
+    return yaml.load(stream, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+
+
+@lru_cache(maxsize=None)
+def _load_dotenv_once() -> None:
+    """Load .env into the environment the first time a ConfigManager is created in this process."""
+    from dotenv import load_dotenv
+    load_dotenv()
+
+
+def _config_cache_path(config_path: Path) -> Path:
+    """Location of the parsed-config cache for a YAML file.
+    
+    The cache lives in the user cache directory rather than next to the YAML, which may
+    be on a read-only mount (docker-compose mounts ./config read-only).
+    """
+    cache_dir = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+    path_hash = hashlib.blake2b(str(config_path.resolve()).encode("utf-8"), digest_size=16).hexdigest()
+    return cache_dir / "copilot-cost-center-manager" / f"config-{path_hash}.json"
+
+
+@lru_cache(maxsize=8)
+def _load_config_data(path: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    """Parse a YAML config file, reusing a cached JSON copy while the file is unchanged.
+    
+    The mtime and size are part of the memoization key, so an edited file is re-read
+    automatically, even when an edit lands within the filesystem's mtime granularity.
+    """
+    config_path = Path(path)
+    try:
+        cache_path = _config_cache_path(config_path)
+    except (OSError, RuntimeError, KeyError):
+        # No usable home directory to derive the cache location from
+        cache_path = None
+    
+    if cache_path is not None:
+        try:
+            with open(cache_path, 'rb') as f:
+                cached = json_utils.loads(f.read())
+            if cached.get("version") == CONFIG_CACHE_VERSION and cached.get("key") == [mtime_ns, size]:
+                logger.debug(f"Loaded configuration from cache {cache_path}")
+                return cached["data"]
+        except (OSError, ValueError, KeyError, AttributeError):
+            pass
+    
+    with open(config_path, 'r', encoding='utf-8') as f:
+        config_data = _yaml_safe_load(f) or {}
+    
+    if cache_path is None:
+        return config_data
+    try:
+        # Only cache configs that survive a JSON round trip unchanged (YAML can also yield
+        # dates and integer keys), so a cached load always equals a fresh parse
+        if json_utils.loads(json_utils.dumps(config_data)) != config_data:
+            logger.debug(f"Not caching configuration {config_path}: it contains non-JSON values")
+            return config_data
+        _ensure_dir(cache_path.parent)
+        _write_json_atomic(cache_path, {"version": CONFIG_CACHE_VERSION, "key": [mtime_ns, size], "data": config_data})
+    except (OSError, TypeError, ValueError) as e:
+        logger.debug(f"Could not write config cache {cache_path}: {e}")
+    
+    return config_data
+
+
+def _ensure_dir(path: Path) -> None:
+    """Create a directory unless it already exists, skipping the mkdir call in the common case."""
+    if not path.is_dir():
+        path.mkdir(parents=True, exist_ok=True)
+
+
+def _write_json_atomic(path: Path, data: Any) -> None:
+    """Write JSON via a temp file and rename, so a concurrent reader never sees a partial file."""
+    tmp_path = None
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+        with os.fdopen(fd, 'wb') as f:
+            f.write(json_utils.dumps(data))
+        os.replace(tmp_path, path)
+    except BaseException:
+        if tmp_path and os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
 
 
 class ConfigManager:
@@ -20,8 +149,9 @@ class ConfigManager:
         self.logger = logging.getLogger(__name__)
         self.config_path = Path(config_path)
         
-        # Load environment variables
-        load_dotenv()
+        # Load environment variables from .env unless the caller opts out (e.g. env already set by CI)
+        if not os.environ.get("SKIP_DOTENV"):
+            _load_dotenv_once()
         
         # Load configuration
         self._load_config()
@@ -30,32 +160,39 @@ class ConfigManager:
         """Load main configuration from YAML file."""
         try:
             if self.config_path.exists():
-                with open(self.config_path, 'r', encoding='utf-8') as f:
-                    config_data = yaml.safe_load(f) or {}
+                config_data = self._read_config_file()
             else:
                 self.logger.warning(f"Config file {self.config_path} not found, using defaults")
                 config_data = {}
             
+            # Read each environment override once
+            env_token = os.environ.get("GITHUB_TOKEN")
+            env_tokens = os.environ.get("GITHUB_TOKENS")
+            env_enterprise = os.environ.get("GITHUB_ENTERPRISE")
+            
             # GitHub configuration
             github_config = config_data.get("github", {})
+            # Optional additional tokens; API requests are spread across all tokens round-robin
+            extra_tokens = env_tokens.split(",") if env_tokens else (github_config.get("tokens") or [])
+            extra_tokens = [token.strip() for token in extra_tokens if token and token.strip()]
             self.github_token = (
-                os.getenv("GITHUB_TOKEN") or 
+                env_token or 
                 github_config.get("token") or 
+                (extra_tokens[0] if extra_tokens else None) or
                 self._prompt_for_token()
             )
+            self.github_tokens = list(dict.fromkeys([self.github_token] + extra_tokens))
             
             # Enterprise-only setup with placeholder awareness
-            placeholder_enterprise_values = {"", None, "REPLACE_WITH_ENTERPRISE_SLUG", "your_enterprise_name"}
             self.github_enterprise = (
-                os.getenv("GITHUB_ENTERPRISE") or 
+                env_enterprise or 
                 github_config.get("enterprise")
             )
             # If still placeholder, treat as unset
-            if self.github_enterprise in placeholder_enterprise_values:
-                # Try env again explicitly (in case yaml had placeholder overriding)
-                env_val = os.getenv("GITHUB_ENTERPRISE")
-                if env_val and env_val not in placeholder_enterprise_values:
-                    self.github_enterprise = env_val
+            if self.github_enterprise in PLACEHOLDER_ENTERPRISE_VALUES:
+                # Fall back to the env value (in case yaml had placeholder overriding)
+                if env_enterprise and env_enterprise not in PLACEHOLDER_ENTERPRISE_VALUES:
+                    self.github_enterprise = env_enterprise
                 else:
                     self.github_enterprise = None
             
@@ -83,7 +220,8 @@ class ConfigManager:
                 cost_center_config.get("prus_allowed_cost_center") or
                 "CC-002-PRUS-ALLOWED"
             )
-            self.prus_exception_users = (
+            # Stored as a frozenset so membership checks are O(1) wherever they happen
+            self.prus_exception_users = frozenset(
                 cost_center_config.get("prus_exception_users") or
                 []
             )
@@ -95,28 +233,41 @@ class ConfigManager:
             
             # Incremental processing configuration
             self.enable_incremental = cost_center_config.get("enable_incremental", False)
-            self.timestamp_file = Path(self.export_dir) / ".last_run_timestamp"
+            # Run state (last run timestamp, seat page cache, applied hashes) lives in one file
+            self.state_file = Path(self.export_dir) / ".state.json"
+            # Pre-consolidation location of the last run timestamp, migrated on first load
+            self.legacy_timestamp_file = Path(self.export_dir) / ".last_run_timestamp"
+            self._state: Optional[Dict[str, Any]] = None
             
             # Store full config for other methods
             self.config = config_data
             
+            # Cost center URLs share this prefix; None while the enterprise is a placeholder
+            self._cost_center_url_prefix = (
+                f"https://github.com/enterprises/{self.github_enterprise}/billing/cost_centers/"
+                if not self.github_enterprise.startswith("REPLACE_WITH_") else None
+            )
+            
         except Exception as e:
             self.logger.error(f"Error loading configuration: {str(e)}")
             raise
 
         # Post-load sanity warnings for placeholder values will be checked later
 
+    def _read_config_file(self) -> Dict[str, Any]:
+        """Parse the YAML config file, memoized per process on (path, mtime, size)."""
+        path = str(self.config_path.resolve())
+        stat = self.config_path.stat()
+        # Hand out a private copy so callers can never mutate the memoized data
+        return copy.deepcopy(_load_config_data(path, stat.st_mtime_ns, stat.st_size))
+
     def _warn_on_placeholders(self):
         """Emit warnings if placeholder values are still present in config."""
         # Skip placeholder warnings if auto-creation is enabled
         if self.auto_create_cost_centers:
             return
             
-        placeholder_tokens = {
-            "no_prus_cost_center": ["REPLACE_WITH_NO_PRUS_COST_CENTER_ID", "CC-001-NO-PRUS"],
-            "prus_allowed_cost_center": ["REPLACE_WITH_PRUS_ALLOWED_COST_CENTER_ID", "CC-002-PRUS-ALLOWED"],
-        }
-        for attr, placeholders in placeholder_tokens.items():
+        for attr, placeholders in PLACEHOLDER_COST_CENTER_VALUES.items():
             value = getattr(self, attr, None)
             if value in placeholders:
                 self.logger.warning(
@@ -129,6 +280,12 @@ class ConfigManager:
                 "No PRUs exception users configured. All users will be assigned to the default 'no_prus_cost_center'."
             )
     
+    def cost_center_url(self, cost_center_id: str) -> Optional[str]:
+        """Return the GitHub billing URL for a cost center, or None if it can't be built from placeholders."""
+        if self._cost_center_url_prefix is None or cost_center_id.startswith("REPLACE_WITH_"):
+            return None
+        return self._cost_center_url_prefix + cost_center_id
+    
     def load_cost_center_config(self) -> Dict[str, Any]:
         """Load cost center configuration from main config file."""
         # Cost center config is now part of the main config
@@ -162,19 +319,12 @@ class ConfigManager:
         if not self.github_enterprise:
             issues.append("GitHub enterprise must be configured")
         
-        # Check if export directory is writable
-        export_path = Path(self.export_dir)
-        try:
-            export_path.mkdir(exist_ok=True)
-        except Exception:
-            issues.append(f"Cannot create export directory: {self.export_dir}")
-        
-        # Check if log directory is writable
-        log_path = Path(self.log_file).parent
-        try:
-            log_path.mkdir(exist_ok=True)
-        except Exception:
-            issues.append(f"Cannot create log directory: {log_path}")
+        # Check that the export and log directories exist or can be created
+        for label, directory in (("export", Path(self.export_dir)), ("log", Path(self.log_file).parent)):
+            try:
+                _ensure_dir(directory)
+            except Exception:
+                issues.append(f"Cannot create {label} directory: {directory}")
         
         if issues:
             for issue in issues:
@@ -186,48 +336,21 @@ class ConfigManager:
     def create_example_config(self, force: bool = False):
         """Create example configuration files."""
         config_dir = Path("config")
-        config_dir.mkdir(exist_ok=True)
+        _ensure_dir(config_dir)
         
         # Main config file
         main_config_path = config_dir / "config.example.yaml"
         if not main_config_path.exists() or force:
-            example_config = {
-                "github": {
-                    "token": "your_github_personal_access_token_here",
-                    "enterprise": "your_enterprise_name"
-                },
-                "export": {
-                    "directory": "exports",
-                    "formats": ["csv", "excel"]
-                },
-                "logging": {
-                    "level": "INFO",
-                    "file": "logs/copilot_manager.log"
-                },
-                "cost_centers": {
-                    "no_prus_cost_center": "CC-001-NO-PRUS",
-                    "prus_allowed_cost_center": "CC-002-PRUS-ALLOWED"
-                }
-            }
-            
             with open(main_config_path, 'w', encoding='utf-8') as f:
-                yaml.dump(example_config, f, default_flow_style=False)
+                f.write(EXAMPLE_CONFIG_YAML)
             
             self.logger.info(f"Created example config: {main_config_path}")
         
         # Cost center rules file
         rules_config_path = config_dir / "cost_centers.example.yaml"
         if not rules_config_path.exists() or force:
-            example_rules = {
-                "prus_exception_users": [
-                    "john.doe",
-                    "jane.smith",
-                    "admin.user"
-                ]
-            }
-            
             with open(rules_config_path, 'w', encoding='utf-8') as f:
-                yaml.dump(example_rules, f, default_flow_style=False)
+                f.write(EXAMPLE_RULES_YAML)
             
             self.logger.info(f"Created example cost center rules: {rules_config_path}")
     
@@ -239,69 +362,123 @@ class ConfigManager:
         """Check and emit configuration warnings after all initialization is complete."""
         self._warn_on_placeholders()
     
-    def save_last_run_timestamp(self, timestamp: Optional[datetime] = None) -> None:
-        """Save the last run timestamp to file."""
-        if timestamp is None:
-            timestamp = datetime.utcnow()
+    def load_state(self) -> Dict[str, Any]:
+        """Load the persisted run state, reading the state file at most once per process."""
+        if self._state is not None:
+            return self._state
         
-        # Ensure export directory exists
-        self.timestamp_file.parent.mkdir(exist_ok=True)
+        state: Dict[str, Any] = {}
+        try:
+            with open(self.state_file, 'rb') as f:
+                state = json_utils.loads(f.read())
+            if not isinstance(state, dict):
+                self.logger.warning("Invalid state file format")
+                state = {}
+        except FileNotFoundError:
+            state = self._load_legacy_state()
+        except Exception as e:
+            self.logger.warning(f"Failed to load state file: {e}")
+        
+        self._state = state
+        return state
+    
+    def _load_legacy_state(self) -> Dict[str, Any]:
+        """Seed the state from a pre-consolidation .last_run_timestamp file, if present."""
+        if not self.legacy_timestamp_file.exists():
+            return {}
+        
+        try:
+            with open(self.legacy_timestamp_file, 'r') as f:
+                timestamp_data = json.load(f)
+            self.logger.info(f"Migrating {self.legacy_timestamp_file} into {self.state_file}")
+            return {key: timestamp_data[key] for key in ("last_run", "saved_at") if key in timestamp_data}
+        except Exception as e:
+            self.logger.warning(f"Failed to read legacy timestamp file: {e}")
+            return {}
+    
+    def save_state(self, **updates: Any) -> bool:
+        """Merge updates into the run state and rewrite the state file atomically."""
+        state = self.load_state()
+        state.update(updates)
         
-        timestamp_data = {
-            "last_run": timestamp.isoformat() + "Z",
-            "saved_at": datetime.utcnow().isoformat() + "Z"
-        }
+        # Ensure export directory exists
+        _ensure_dir(self.state_file.parent)
         
         try:
-            with open(self.timestamp_file, 'w') as f:
-                json.dump(timestamp_data, f, indent=2)
-            self.logger.info(f"Saved last run timestamp: {timestamp.isoformat()}Z")
+            _write_json_atomic(self.state_file, state)
+            return True
         except Exception as e:
-            self.logger.error(f"Failed to save last run timestamp: {e}")
+            self.logger.error(f"Failed to save state file: {e}")
+            return False
+    
+    def save_last_run_timestamp(self, timestamp: Optional[datetime] = None) -> None:
+        """Save the last run timestamp to the state file."""
+        now = datetime.now(timezone.utc)
+        if timestamp is None:
+            timestamp = now
+        elif timestamp.tzinfo is None:
+            # Naive timestamps are taken to be UTC, as utcnow() used to produce
+            timestamp = timestamp.replace(tzinfo=timezone.utc)
+        
+        last_run = timestamp.astimezone(timezone.utc).isoformat(timespec='seconds').replace('+00:00', 'Z')
+        saved_at = now.isoformat(timespec='seconds').replace('+00:00', 'Z')
+        if self.save_state(last_run=last_run, saved_at=saved_at):
+            self.logger.info(f"Saved last run timestamp: {last_run}")
     
     def load_last_run_timestamp(self) -> Optional[datetime]:
-        """Load the last run timestamp from file."""
-        if not self.timestamp_file.exists():
+        """Load the last run timestamp from the state file."""
+        timestamp_str = self.load_state().get('last_run')
+        if not timestamp_str:
             self.logger.info("No previous run timestamp found - will process all users")
             return None
         
         try:
-            with open(self.timestamp_file, 'r') as f:
-                timestamp_data = json.load(f)
-            
-            timestamp_str = timestamp_data.get('last_run')
-            if timestamp_str:
-                # Parse ISO format timestamp
-                timestamp = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-                self.logger.info(f"Loaded last run timestamp: {timestamp_str}")
-                return timestamp
-            else:
-                self.logger.warning("Invalid timestamp file format")
-                return None
-                
+            # Parse ISO format timestamp
+            timestamp = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
+            self.logger.info(f"Loaded last run timestamp: {timestamp_str}")
+            return timestamp
         except Exception as e:
             self.logger.error(f"Failed to load last run timestamp: {e}")
             return None
 
+    def save_seats_cache(self, seats_cache: Dict[str, Any]) -> None:
+        """Save the Copilot seat page cache (ETags and seats) for conditional requests."""
+        if self.save_state(seats_cache=seats_cache):
+            self.logger.debug(f"Saved seat cache with {len(seats_cache.get('pages', {}))} pages")
+    
+    def load_seats_cache(self) -> Dict[str, Any]:
+        """Load the Copilot seat page cache, returning an empty cache if none is usable."""
+        seats_cache = self.load_state().get("seats_cache", {})
+        if not isinstance(seats_cache, dict):
+            self.logger.warning("Invalid seat cache format in state file")
+            return {}
+        return seats_cache
+
+    def save_applied_hashes(self, applied_hashes: Dict[str, str]) -> None:
+        """Save the member-list fingerprint of each successfully applied cost center."""
+        self.save_state(applied_hashes=applied_hashes)
+    
+    def load_applied_hashes(self) -> Dict[str, str]:
+        """Load the member-list fingerprints from the last successful apply."""
+        applied_hashes = self.load_state().get("applied_hashes", {})
+        if not isinstance(applied_hashes, dict):
+            self.logger.warning("Invalid applied assignment hashes format in state file")
+            return {}
+        return applied_hashes
+
     def get_config_summary(self) -> Dict[str, Any]:
         """Get a summary of current configuration."""
-        # Construct cost center URLs if enterprise is configured
-        no_prus_url = None
-        prus_allowed_url = None
-        if self.github_enterprise:
-            no_prus_url = f"https://github.com/enterprises/{self.github_enterprise}/billing/cost_centers/{self.no_prus_cost_center}"
-            prus_allowed_url = f"https://github.com/enterprises/{self.github_enterprise}/billing/cost_centers/{self.prus_allowed_cost_center}"
-        
         return {
             "github_enterprise": self.github_enterprise,
             "github_token_set": bool(self.github_token),
+            "github_token_count": len(self.github_tokens),
             "export_dir": self.export_dir,
             "export_formats": self.export_formats,
             "log_level": self.log_level,
             "log_file": self.log_file,
             "no_prus_cost_center": self.no_prus_cost_center,
-            "no_prus_cost_center_url": no_prus_url,
+            "no_prus_cost_center_url": self.cost_center_url(self.no_prus_cost_center),
             "prus_allowed_cost_center": self.prus_allowed_cost_center,
-            "prus_allowed_cost_center_url": prus_allowed_url,
+            "prus_allowed_cost_center_url": self.cost_center_url(self.prus_allowed_cost_center),
             "prus_exception_users_count": len(self.prus_exception_users)
         }
\ No newline at end of file
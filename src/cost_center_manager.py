@@ -3,8 +3,13 @@ Simplified Cost Center Manager for PRUs-based assignment.
 """
 
 import logging
+from collections import Counter
 from typing import Dict, List
 
+# Values stored in each user's "assignment_method"; shared so every record references the same objects
+ASSIGNMENT_METHOD_PRUS_EXCEPTION = "prus_exception"
+ASSIGNMENT_METHOD_DEFAULT = "default_no_prus"
+
 
 class CostCenterManager:
     """Manages simplified cost center assignments for users."""
@@ -15,7 +20,7 @@ class CostCenterManager:
         self.logger = logging.getLogger(__name__)
         self.cost_center_no_prus = config.no_prus_cost_center
         self.cost_center_prus_allowed = config.prus_allowed_cost_center
-        self.prus_exception_users = set(config.prus_exception_users)
+        self.prus_exception_users = frozenset(config.prus_exception_users)
         self.current_assignments = {}
         
         self.logger.info(f"Initialized CostCenterManager with {len(self.prus_exception_users)} PRUs exception users")
@@ -43,41 +48,76 @@ class CostCenterManager:
         """
         username = user.get("login", "")
         
+        # %-style arguments so the message is only formatted when DEBUG is enabled
         if username in self.prus_exception_users:
-            self.logger.debug(f"User {username} is in PRUs exception list → {self.cost_center_prus_allowed}")
-            user["assignment_method"] = "prus_exception"
+            self.logger.debug("User %s is in PRUs exception list → %s", username, self.cost_center_prus_allowed)
+            user["assignment_method"] = ASSIGNMENT_METHOD_PRUS_EXCEPTION
             return self.cost_center_prus_allowed
         else:
-            self.logger.debug(f"User {username} is not in exception list → {self.cost_center_no_prus}")
-            user["assignment_method"] = "default_no_prus"
+            self.logger.debug("User %s is not in exception list → %s", username, self.cost_center_no_prus)
+            user["assignment_method"] = ASSIGNMENT_METHOD_DEFAULT
             return self.cost_center_no_prus
     
     def bulk_assign_cost_centers(self, users: List[Dict]) -> List[Dict]:
         """Assign cost centers to a list of users."""
+        self.group_users_by_cost_center(users)
+        return users
+    
+    def group_users_by_cost_center(self, users: List[Dict]) -> Dict[str, List[str]]:
+        """Assign cost centers to a list of users and group their logins by cost center.
+        
+        Classification and grouping happen in the same pass over the users, so the
+        group sizes double as the assignment counts.
+        """
         self.logger.info(f"Bulk assigning cost centers for {len(users)} users")
         
+        # Same rules as assign_cost_center(), inlined with locals for large rosters
+        exception_users = self.prus_exception_users
+        prus_cost_center = self.cost_center_prus_allowed
+        no_prus_cost_center = self.cost_center_no_prus
+        groups = {prus_cost_center: [], no_prus_cost_center: []}
+        debug_enabled = self.logger.isEnabledFor(logging.DEBUG)
+        
+        if not exception_users:
+            # Common case: with no exceptions everyone gets the default, no lookups needed
+            no_prus_logins = groups[no_prus_cost_center]
+            for user in users:
+                username = user.get("login", "")
+                user["cost_center"] = no_prus_cost_center
+                user["assignment_method"] = ASSIGNMENT_METHOD_DEFAULT
+                no_prus_logins.append(username)
+                if debug_enabled:
+                    self.logger.debug("User %s → %s", username, no_prus_cost_center)
+            self.logger.info(f"Assignment complete: 0 PRUs allowed, {len(users)} no PRUs")
+            return groups
+        
         prus_count = 0
-        no_prus_count = 0
+        
+        # (cost_center, assignment_method, logins) indexed by exception membership (False=0, True=1)
+        assignments = (
+            (no_prus_cost_center, ASSIGNMENT_METHOD_DEFAULT, groups[no_prus_cost_center]),
+            (prus_cost_center, ASSIGNMENT_METHOD_PRUS_EXCEPTION, groups[prus_cost_center]),
+        )
         
         for user in users:
-            cost_center = self.assign_cost_center(user)
+            username = user.get("login", "")
+            is_exception = username in exception_users
+            cost_center, assignment_method, logins = assignments[is_exception]
             user["cost_center"] = cost_center
-            
-            if cost_center == self.cost_center_prus_allowed:
-                prus_count += 1
-            else:
-                no_prus_count += 1
+            user["assignment_method"] = assignment_method
+            logins.append(username)
+            prus_count += is_exception
+            if debug_enabled:
+                self.logger.debug("User %s → %s", username, cost_center)
+        
+        no_prus_count = len(users) - prus_count
         
         self.logger.info(f"Assignment complete: {prus_count} PRUs allowed, {no_prus_count} no PRUs")
-        return users
+        return groups
     
     def generate_summary(self, users: List[Dict]) -> Dict[str, int]:
         """Generate a summary of cost center assignments."""
-        summary = {}
-        
-        for user in users:
-            cost_center = user.get("cost_center", "Unassigned")
-            summary[cost_center] = summary.get(cost_center, 0) + 1
+        summary = dict(Counter(user.get("cost_center", "Unassigned") for user in users))
         
         self.logger.info(f"Cost center summary: {len(summary)} unique cost centers")
         return summary
@@ -97,40 +137,48 @@ class CostCenterManager:
         if self.cost_center_no_prus == self.cost_center_prus_allowed:
             issues.append("no_prus_cost_center and prus_allowed_cost_center cannot be the same")
         
-        # Validate exception users list
-        if not isinstance(self.prus_exception_users, (list, set)):
-            issues.append("prus_exception_users must be a list")
-        
         return issues
     
-    def get_cost_center_statistics(self, users: List[Dict]) -> Dict:
-        """Get detailed statistics about cost center assignments."""
-        prus_users = []
-        no_prus_users = []
+    def get_cost_center_statistics(self, users: List[Dict], include_users: bool = False) -> Dict:
+        """Get detailed statistics about cost center assignments.
+        
+        Usernames per cost center are only collected when include_users is True.
+        """
+        prus_cost_center = self.cost_center_prus_allowed
+        no_prus_cost_center = self.cost_center_no_prus
+        prus_count = 0
+        no_prus_count = 0
+        prus_users = [] if include_users else None
+        no_prus_users = [] if include_users else None
         
         for user in users:
             cost_center = user.get("cost_center")
-            username = user.get("login")
             
-            if cost_center == self.cost_center_prus_allowed:
-                prus_users.append(username)
-            elif cost_center == self.cost_center_no_prus:
-                no_prus_users.append(username)
+            if cost_center == prus_cost_center:
+                prus_count += 1
+                if include_users:
+                    prus_users.append(user.get("login"))
+            elif cost_center == no_prus_cost_center:
+                no_prus_count += 1
+                if include_users:
+                    no_prus_users.append(user.get("login"))
         
         stats = {
             "total_users": len(users),
             "prus_allowed": {
-                "cost_center": self.cost_center_prus_allowed,
-                "count": len(prus_users),
-                "users": prus_users
+                "cost_center": prus_cost_center,
+                "count": prus_count
             },
             "no_prus": {
-                "cost_center": self.cost_center_no_prus,
-                "count": len(no_prus_users),
-                "users": no_prus_users
+                "cost_center": no_prus_cost_center,
+                "count": no_prus_count
             },
             "configured_exceptions": len(self.prus_exception_users),
-            "actual_exceptions": len(prus_users)
+            "actual_exceptions": prus_count
         }
         
-        return stats
\ No newline at end of file
+        if include_users:
+            stats["prus_allowed"]["users"] = prus_users
+            stats["no_prus"]["users"] = no_prus_users
+        
+        return stats
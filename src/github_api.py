@@ -2,14 +2,130 @@
 GitHub API Manager for Copilot license operations.
 """
 
+import itertools
 import logging
+import random
+import threading
 import time
-from typing import Dict, List, Optional
-from datetime import datetime
+from collections import Counter, defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from typing import Dict, Iterator, List, Optional, Tuple
+from datetime import datetime, timezone
+from urllib.parse import parse_qs, urlparse
 import requests
 from requests.adapters import HTTPAdapter
+from requests.auth import AuthBase
+from urllib3.exceptions import MaxRetryError
 from urllib3.util.retry import Retry
 
+from . import json_utils
+
+# Upper bound on in-flight API requests, kept low to stay clear of GitHub's secondary rate limits
+MAX_CONCURRENT_REQUESTS = 8
+
+# Maximum number of users the cost center resource endpoint accepts per request
+MAX_USERS_PER_REQUEST = 50
+
+# Requests held back per token so other tools sharing it are not starved near the hourly limit
+RATE_LIMIT_BUFFER = 100
+
+# Rate-limited requests are retried with capped exponential backoff (full jitter)
+MAX_RATE_LIMIT_RETRIES = 5
+RATE_LIMIT_BACKOFF_BASE = 1.0
+RATE_LIMIT_BACKOFF_CAP = 60.0
+
+
+@lru_cache(maxsize=4096)
+def _parse_iso_timestamp(value: str) -> datetime:
+    """Parse an ISO 8601 timestamp, memoized since seats provisioned together share timestamps."""
+    # Older Pythons don't accept a "Z" suffix in fromisoformat
+    if value.endswith('Z'):
+        value = value[:-1] + '+00:00'
+    return datetime.fromisoformat(value)
+
+
+@lru_cache(maxsize=16)
+def _canonical_utc(timestamp: datetime) -> Optional[str]:
+    """Render an aware timestamp as "YYYY-MM-DDTHH:MM:SSZ" in UTC, or None if it is naive.
+    
+    Truncating to whole seconds is safe for "created after" checks: a whole-second
+    created_at is later than t exactly when it is later than t rounded down.
+    """
+    if timestamp.tzinfo is None:
+        return None
+    return timestamp.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class _RoundRobinTokenAuth(AuthBase):
+    """Authenticate each request with the next token in the pool.
+    
+    Every response's X-RateLimit-Remaining / X-RateLimit-Reset headers are recorded per
+    token. Tokens with fewer than RATE_LIMIT_BUFFER requests left are skipped until their
+    reset time; when every token is that low, the request waits for the earliest reset
+    instead of running the budget dry. Safe to share between worker threads.
+    """
+    
+    def __init__(self, tokens: List[str]):
+        self._tokens = list(tokens)
+        self._cycle = itertools.cycle(range(len(self._tokens)))
+        # token index -> (remaining requests, reset epoch) as last reported by GitHub
+        self._budget: Dict[int, Tuple[int, float]] = {}
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+    
+    def _next_token_index(self) -> Tuple[int, float]:
+        """Return the next usable token index and how long to wait before using it."""
+        with self._lock:
+            now = time.time()
+            for _ in range(len(self._tokens)):
+                index = next(self._cycle)
+                remaining, reset = self._budget.get(index, (RATE_LIMIT_BUFFER, 0.0))
+                if remaining >= RATE_LIMIT_BUFFER or reset <= now:
+                    return index, 0.0
+            # Every token is low on budget; wait for the one that resets first
+            index = min(self._budget, key=lambda i: self._budget[i][1])
+            return index, self._budget[index][1] - now
+    
+    def _record_rate_limit(self, index: int, response: requests.Response, *args, **kwargs) -> requests.Response:
+        remaining = response.headers.get("X-RateLimit-Remaining")
+        reset = response.headers.get("X-RateLimit-Reset")
+        if remaining is not None and reset:
+            try:
+                budget = (int(remaining), float(reset))
+            except ValueError:
+                return response
+            with self._lock:
+                self._budget[index] = budget
+        return response
+    
+    def __call__(self, request: requests.PreparedRequest) -> requests.PreparedRequest:
+        index, wait_time = self._next_token_index()
+        if wait_time > 0:
+            self.logger.warning(
+                f"Rate limit budget below {RATE_LIMIT_BUFFER} requests. Waiting {wait_time:.0f} seconds for reset..."
+            )
+            time.sleep(wait_time)
+        request.headers["Authorization"] = f"token {self._tokens[index]}"
+        request.register_hook("response", partial(self._record_rate_limit, index))
+        return request
+
+
+class _RateLimitAwareRetry(Retry):
+    """urllib3 retry policy that leaves exhausted-token 429s to GitHubCopilotManager._request.
+    
+    Auth runs once per prepared request, so retrying a 429 with X-RateLimit-Remaining: 0
+    here would resend it with the same empty token. Stopping the retries hands the
+    response straight back (raise_on_status=False), and _request then switches tokens or
+    waits for the reset.
+    """
+    
+    def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None):
+        if (response is not None and response.status == 429
+                and response.headers.get("X-RateLimit-Remaining") == "0"):
+            raise MaxRetryError(_pool, url, "token rate limit exhausted")
+        return super().increment(method, url, response, error, _pool, _stacktrace)
+
 
 class GitHubCopilotManager:
     """Manages GitHub API operations for Copilot licenses."""
@@ -27,24 +143,38 @@ class GitHubCopilotManager:
         if not self.enterprise_name:
             raise ValueError("Enterprise name is required")
         
+        # Unique seat holders seen by the last get_copilot_users() call, before any `since` filter
+        self.total_copilot_users: Optional[int] = None
+        
     def _create_session(self) -> requests.Session:
         """Create a configured requests session with retry logic."""
         session = requests.Session()
         
-        # Configure retry strategy
-        retry_strategy = Retry(
-            total=3,
-            backoff_factor=1,
+        # One retry policy for 429s and transient server errors on reads and writes alike;
+        # both POST endpoints are safe to repeat (re-adding members, 409 for an existing cost center).
+        # 429s from an exhausted token are left to _request, which can pick another token
+        retry_strategy = _RateLimitAwareRetry(
+            total=5,
+            backoff_factor=0.5,
+            # Random extra delay so concurrent workers don't retry in lockstep
+            backoff_jitter=0.25,
             status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=frozenset(["GET", "POST"]),
+            respect_retry_after_header=True,
+            # Hand the final response back so callers can report its status code
+            raise_on_status=False,
         )
         
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        # One keep-alive connection per worker thread; more would sit idle, fewer would make workers wait
+        adapter = HTTPAdapter(max_retries=retry_strategy, pool_maxsize=MAX_CONCURRENT_REQUESTS, pool_block=False)
         session.mount("http://", adapter)
         session.mount("https://", adapter)
         
+        # Tokens are attached per request so load is spread across all configured tokens
+        session.auth = _RoundRobinTokenAuth(self.config.github_tokens)
+        
         # Set headers
         session.headers.update({
-            "Authorization": f"token {self.config.github_token}",
             "Accept": "application/vnd.github+json",
             "User-Agent": "Copilot-Cost-Center-Manager",
             "X-GitHub-Api-Version": "2022-11-28"
@@ -52,49 +182,209 @@ class GitHubCopilotManager:
         
         return session
     
+    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a request, retrying rate limits that the adapter's Retry policy can't clear."""
+        attempt = 0
+        while True:
+            response = self.session.request(method, url, **kwargs)
+            if not self._is_rate_limited(response) or attempt >= MAX_RATE_LIMIT_RETRIES:
+                return response
+            wait_time = self._rate_limit_delay(response, attempt)
+            self.logger.warning(f"Rate limit hit ({response.status_code}). Waiting {wait_time:.1f} seconds...")
+            time.sleep(wait_time)
+            attempt += 1
+    
+    @staticmethod
+    def _is_rate_limited(response: requests.Response) -> bool:
+        """Whether a response is a rate limit that needs handling above the urllib3 retries.
+        
+        Transient 429s are retried by the adapter. What is left is an exhausted token
+        (X-RateLimit-Remaining: 0), where retrying needs another token or the reset, and
+        403 secondary limits, which urllib3 can't tell apart from permission errors.
+        """
+        if response.headers.get("X-RateLimit-Remaining") == "0":
+            return response.status_code in (403, 429)
+        return response.status_code == 403 and (
+            "Retry-After" in response.headers or "rate limit" in response.text.lower()
+        )
+    
+    @staticmethod
+    def _rate_limit_delay(response: requests.Response, attempt: int) -> float:
+        """Seconds to wait before retrying a rate-limited request."""
+        retry_after = response.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            return float(retry_after)
+        if response.headers.get("X-RateLimit-Remaining") == "0":
+            # Primary limit: the token auth already waits for the reset (or switches tokens)
+            return 0.0
+        # Secondary limit without a hint: capped exponential backoff with full jitter
+        return random.uniform(0, min(RATE_LIMIT_BACKOFF_CAP, RATE_LIMIT_BACKOFF_BASE * 2 ** attempt))
+    
     def _make_request(self, url: str, params: Optional[Dict] = None) -> Dict:
         """Make a GitHub API request with error handling."""
+        return self._json(self._get(url, params))
+    
+    def _get(self, url: str, params: Optional[Dict] = None, headers: Optional[Dict] = None) -> requests.Response:
+        """Make a GitHub API GET request with error handling, returning the raw response."""
         try:
-            response = self.session.get(url, params=params)
-            
-            # Handle rate limiting
-            if response.status_code == 429:
-                reset_time = int(response.headers.get('X-RateLimit-Reset', time.time() + 60))
-                wait_time = reset_time - int(time.time()) + 1
-                self.logger.warning(f"Rate limit hit. Waiting {wait_time} seconds...")
-                time.sleep(wait_time)
-                return self._make_request(url, params)
-            
+            response = self._request("GET", url, params=params, headers=headers)
             response.raise_for_status()
-            return response.json()
+            return response
             
         except requests.exceptions.RequestException as e:
             self.logger.error(f"API request failed: {str(e)}")
             raise
     
-    def get_copilot_users(self) -> List[Dict]:
-        """Get all Copilot license holders in the enterprise."""
+    @staticmethod
+    def _json(response: requests.Response):
+        """Decode a JSON response body, using orjson when it is installed."""
+        return json_utils.loads(response.content)
+    
+    @staticmethod
+    def _last_page(response: requests.Response) -> Optional[int]:
+        """Return the last page number advertised in the Link header, if any."""
+        last_url = response.links.get("last", {}).get("url")
+        if not last_url:
+            return None
+        try:
+            return int(parse_qs(urlparse(last_url).query)["page"][0])
+        except (KeyError, IndexError, ValueError):
+            return None
+    
+    def get_copilot_users(self, page_cache: Optional[Dict] = None,
+                          since: Optional[datetime] = None) -> List[Dict]:
+        """Get all Copilot license holders in the enterprise.
+        
+        See iter_copilot_users() for the arguments.
+        """
+        return list(self.iter_copilot_users(page_cache=page_cache, since=since))
+    
+    def iter_copilot_users(self, page_cache: Optional[Dict] = None,
+                           since: Optional[datetime] = None) -> Iterator[Dict]:
+        """Yield Copilot license holders in the enterprise as their seat pages arrive.
+        
+        Users are de-duplicated by login on the fly, and at most MAX_CONCURRENT_REQUESTS
+        pages are fetched ahead of the one being processed, so memory stays bounded by a
+        few pages of raw seats. total_copilot_users is set once the iterator is exhausted.
+        
+        Args:
+            page_cache: Optional cache of seat pages from a previous run (see
+                ConfigManager.load_seats_cache). Pages are requested conditionally with
+                their stored ETag and unchanged pages (HTTP 304) are served from the cache.
+                The cache is updated in place with the pages fetched by this call.
+            since: Only yield users whose seat was created after this timestamp. The
+                seats endpoint has no server-side date filter, so older seats are dropped
+                while de-duplicating instead of in a separate pass.
+        """
         if not (self.use_enterprise and self.enterprise_name):
             raise ValueError("Enterprise name must be configured to fetch Copilot users")
         self.logger.info(f"Fetching Copilot users for enterprise: {self.enterprise_name}")
         url = f"{self.base_url}/enterprises/{self.enterprise_name}/copilot/billing/seats"
         
-        all_users = []
-        page = 1
         per_page = 100
+        cached_pages = {}
+        if page_cache is not None and page_cache.get("per_page") == per_page:
+            cached_pages = page_cache.get("pages", {})
+        fresh_pages = {}
+        not_modified = 0
         
-        while True:
-            params = {"page": page, "per_page": per_page}
-            response_data = self._make_request(url, params)
+        def fetch_page(page: int) -> requests.Response:
+            cached = cached_pages.get(str(page))
+            headers = {"If-None-Match": cached["etag"]} if cached else None
+            return self._get(url, {"page": page, "per_page": per_page}, headers)
+        
+        def page_seats(page: int, response: requests.Response) -> List[Dict]:
+            nonlocal not_modified
+            if response.status_code == 304:
+                not_modified += 1
+                entry = cached_pages[str(page)]
+            else:
+                entry = {"etag": response.headers.get("ETag"), "seats": self._json(response).get("seats", [])}
+            if entry["etag"]:
+                fresh_pages[str(page)] = entry
+            return entry["seats"]
+        
+        def has_next_page(response: requests.Response, seats: List[Dict]) -> bool:
+            if "Link" in response.headers:
+                return "next" in response.links
+            return len(seats) == per_page
+        
+        def follow_pages(page: int, response: requests.Response,
+                         seats: List[Dict]) -> Iterator[Tuple[int, List[Dict]]]:
+            # Yield this page and every one after it, following rel="next" (or, without a
+            # Link header, stopping at a short page) and prefetching the next page while
+            # the caller processes the current one
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                while True:
+                    pending = executor.submit(fetch_page, page + 1) if has_next_page(response, seats) else None
+                    yield page, seats
+                    if pending is None:
+                        return
+                    page += 1
+                    response = pending.result()
+                    seats = page_seats(page, response)
+        
+        def seat_pages() -> Iterator[Tuple[int, List[Dict]]]:
+            # The first page tells us how many pages exist; the rest are fetched concurrently
+            first_response = fetch_page(1)
+            seats = page_seats(1, first_response)
+            last_page = self._last_page(first_response)
+            # A 304 may come without a Link header. The cached page count is then only a
+            # lower bound (seats may have been added since), so keep paging past it
+            last_page_is_cached = last_page is None and first_response.status_code == 304
+            if last_page_is_cached:
+                last_page = page_cache.get("last_page")
             
-            seats = response_data.get("seats", [])
+            if last_page and last_page > 1:
+                with ThreadPoolExecutor(max_workers=min(MAX_CONCURRENT_REQUESTS, last_page - 1)) as executor:
+                    # Keep a sliding window of pages in flight so fetching never runs more than
+                    # MAX_CONCURRENT_REQUESTS pages ahead of the caller
+                    remaining = iter(range(2, last_page + 1))
+                    window = deque(executor.submit(fetch_page, page)
+                                   for page in itertools.islice(remaining, MAX_CONCURRENT_REQUESTS))
+                    yield 1, seats
+                    page = 1
+                    while window:
+                        response = window.popleft().result()
+                        next_page = next(remaining, None)
+                        if next_page is not None:
+                            window.append(executor.submit(fetch_page, next_page))
+                        page += 1
+                        seats = page_seats(page, response)
+                        if page == last_page and last_page_is_cached:
+                            yield from follow_pages(page, response, seats)
+                        else:
+                            yield page, seats
+            else:
+                yield from follow_pages(1, first_response, seats)
+        
+        # Deduplicate users by login (some API anomalies can return duplicates)
+        seen_logins = set()
+        duplicate_counts = defaultdict(int)
+        total_seats = 0
+        yielded = 0
+        page_count = 0
+        
+        for page, seats in seat_pages():
+            page_count = page
             if not seats:
-                break
+                continue
             
             for seat in seats:
+                total_seats += 1
                 user_info = seat.get("assignee", {})
+                login = user_info.get("login")
+                if not login:
+                    # Skip entries without a login (unexpected)
+                    continue
+                # Check duplicates before building the record so repeated seats cost one set lookup
+                if login in seen_logins:
+                    duplicate_counts[login] += 1
+                    continue
+                seen_logins.add(login)
+                
                 user_data = {
-                    "login": user_info.get("login"),
+                    "login": login,
                     "id": user_info.get("id"),
                     "name": user_info.get("name"),
                     "email": user_info.get("email"),
@@ -108,71 +398,69 @@ class GitHubCopilotManager:
                     # Enterprise-specific fields
                     "assigning_team": seat.get("assigning_team")
                 }
-                all_users.append(user_data)
+                if since is not None and not self._is_created_after(user_data, since):
+                    continue
+                yielded += 1
+                yield user_data
             
             self.logger.info(f"Fetched page {page} with {len(seats)} users")
-            page += 1
-            
-            # Check if we have more pages
-            if len(seats) < per_page:
-                break
         
-        self.logger.info(f"Total Copilot users found: {len(all_users)}")
-        # Deduplicate users by login (some API anomalies can return duplicates)
-        seen_logins = set()
-        unique_users = []
-        duplicate_counts = {}
-        for user in all_users:
-            login = user.get("login")
-            if not login:
-                # Skip entries without a login (unexpected)
-                continue
-            if login in seen_logins:
-                duplicate_counts[login] = duplicate_counts.get(login, 0) + 1
-                continue
-            seen_logins.add(login)
-            unique_users.append(user)
-
+        if page_cache is not None:
+            page_cache.clear()
+            page_cache.update({"per_page": per_page, "last_page": page_count, "pages": fresh_pages})
+            self.logger.info(f"{not_modified} of {page_count} pages unchanged since last fetch (HTTP 304)")
+        
+        self.logger.info(f"Total Copilot users found: {total_seats}")
         if duplicate_counts:
             total_dups = sum(duplicate_counts.values())
-            sample = ", ".join(f"{k} (+{v})" for k, v in list(duplicate_counts.items())[:10])
+            sample = ", ".join(f"{k} (+{v})" for k, v in itertools.islice(duplicate_counts.items(), 10))
             if len(duplicate_counts) > 10:
                 sample += ", ..."
             self.logger.warning(
                 f"Detected and skipped {total_dups} duplicate seat entries across {len(duplicate_counts)} users: {sample}"
             )
-            self.logger.info(f"Unique Copilot users after de-duplication: {len(unique_users)}")
-        return unique_users
+            self.logger.info(f"Unique Copilot users after de-duplication: {len(seen_logins)}")
+        
+        self.total_copilot_users = len(seen_logins)
+        if since is not None:
+            self.logger.info(f"Filtered {len(seen_logins)} users to {yielded} users created after {since}")
     
     def filter_users_by_timestamp(self, users: List[Dict], since_timestamp: datetime) -> List[Dict]:
         """Filter users to only include those created after the given timestamp."""
-        filtered_users = []
-        
-        for user in users:
-            created_at_str = user.get('created_at')
-            if not created_at_str:
-                # If no creation timestamp, include the user (safer approach)
-                filtered_users.append(user)
-                continue
-            
-            try:
-                # Parse the GitHub timestamp (e.g., "2025-04-15T23:45:31-05:00")
-                created_at = datetime.fromisoformat(created_at_str.replace('Z', '+00:00'))
-                
-                if created_at > since_timestamp:
-                    filtered_users.append(user)
-                    self.logger.debug(f"Including user {user.get('login')} (created: {created_at_str})")
-                else:
-                    self.logger.debug(f"Skipping user {user.get('login')} (created: {created_at_str} <= {since_timestamp})")
-                    
-            except Exception as e:
-                self.logger.warning(f"Failed to parse timestamp for user {user.get('login')}: {e}")
-                # Include user if timestamp parsing fails (safer approach)
-                filtered_users.append(user)
+        filtered_users = [user for user in users if self._is_created_after(user, since_timestamp)]
         
         self.logger.info(f"Filtered {len(users)} users to {len(filtered_users)} users created after {since_timestamp}")
         return filtered_users
     
+    def _is_created_after(self, user: Dict, since_timestamp: datetime) -> bool:
+        """Check whether a user's seat was created after the given timestamp.
+        
+        Users without a parseable creation timestamp are included (safer approach).
+        """
+        created_at_str = user.get('created_at')
+        if not created_at_str:
+            return True
+        
+        try:
+            since_str = _canonical_utc(since_timestamp)
+            if since_str is not None and len(created_at_str) == 20 and created_at_str[10] == 'T' and created_at_str[-1] == 'Z':
+                # Canonical UTC strings ("2025-04-15T23:45:31Z") sort in time order; no parse needed
+                is_after = created_at_str > since_str
+            else:
+                # Parse the GitHub timestamp (e.g., "2025-04-15T23:45:31-05:00")
+                is_after = _parse_iso_timestamp(created_at_str) > since_timestamp
+            
+            # %-style arguments so the per-user messages are only formatted when DEBUG is enabled
+            if is_after:
+                self.logger.debug("Including user %s (created: %s)", user.get('login'), created_at_str)
+                return True
+            self.logger.debug("Skipping user %s (created: %s <= %s)", user.get('login'), created_at_str, since_timestamp)
+            return False
+                
+        except Exception as e:
+            self.logger.warning(f"Failed to parse timestamp for user {user.get('login')}: {e}")
+            return True
+    
     def get_user_details(self, username: str) -> Dict:
         """Get detailed information for a specific user."""
         url = f"{self.base_url}/users/{username}"
@@ -183,7 +471,7 @@ class GitHubCopilotManager:
     # Removed get_copilot_cost_center_assignments as the tool now always assigns deterministically
     
     def add_users_to_cost_center(self, cost_center_id: str, usernames: List[str]) -> Dict[str, bool]:
-        """Add multiple users (up to 50) to a specific cost center.
+        """Add multiple users (up to MAX_USERS_PER_REQUEST) to a specific cost center in one request.
         
         Returns:
             Dict mapping username -> success status for detailed logging
@@ -192,8 +480,8 @@ class GitHubCopilotManager:
             self.logger.warning("Cost center assignment updates only available for GitHub Enterprise")
             return {username: False for username in usernames}
         
-        if len(usernames) > 50:
-            self.logger.error(f"Cannot add more than 50 users at once. Got {len(usernames)} users.")
+        if len(usernames) > MAX_USERS_PER_REQUEST:
+            self.logger.error(f"Cannot add more than {MAX_USERS_PER_REQUEST} users at once. Got {len(usernames)} users.")
             return {username: False for username in usernames}
             
         url = f"{self.base_url}/enterprises/{self.enterprise_name}/settings/billing/cost-centers/{cost_center_id}/resource"
@@ -202,28 +490,15 @@ class GitHubCopilotManager:
             "users": usernames
         }
         
-        # Set proper headers including API version
-        headers = {
-            "accept": "application/vnd.github+json",
-            "x-github-api-version": "2022-11-28",
-            "content-type": "application/json"
-        }
-        
         try:
-            response = self.session.post(url, json=payload, headers=headers)
-            
-            # Handle rate limiting
-            if response.status_code == 429:
-                reset_time = int(response.headers.get('X-RateLimit-Reset', time.time() + 60))
-                wait_time = reset_time - int(time.time()) + 1
-                self.logger.warning(f"Rate limit hit. Waiting {wait_time} seconds...")
-                time.sleep(wait_time)
-                return self.add_users_to_cost_center(cost_center_id, usernames)
+            response = self._request("POST", url, json=payload)
             
             if response.status_code in [200, 201, 204]:
                 self.logger.info(f"✅ Successfully assigned {len(usernames)} users to cost center {cost_center_id}")
-                for username in usernames:
-                    self.logger.info(f"   ✅ {username} → {cost_center_id}")
+                # One line per user is only worth formatting and writing when debugging
+                if self.logger.isEnabledFor(logging.DEBUG):
+                    for username in usernames:
+                        self.logger.debug(f"   ✅ {username} → {cost_center_id}")
                 return {username: True for username in usernames}
             else:
                 self.logger.error(f"❌ Failed to assign users to cost center {cost_center_id}: {response.status_code} {response.text}")
@@ -249,40 +524,49 @@ class GitHubCopilotManager:
         """
         results = {}
         total_users = sum(len(usernames) for usernames in cost_center_assignments.values())
-        successful_users = 0
-        failed_users = 0
+        # Running True/False tally of per-user outcomes, overall and per cost center
+        outcome_counts = Counter()
+        cost_center_counts = defaultdict(Counter)
         
+        # Cost centers hold disjoint sets of users and every batch is an independent POST,
+        # so batches from all cost centers share one bounded pool of workers
+        batch_size = MAX_USERS_PER_REQUEST
+        jobs = []
+        batch_totals = {}
         for cost_center_id, usernames in cost_center_assignments.items():
             if not usernames:
                 continue
-                
-            # Process users in batches of 50
-            batch_size = 50
             batches = [usernames[i:i + batch_size] for i in range(0, len(usernames), batch_size)]
-            
             self.logger.info(f"Processing {len(usernames)} users for cost center {cost_center_id} in {len(batches)} batches")
-            
-            cost_center_results = {}
-            for i, batch in enumerate(batches, 1):
-                self.logger.info(f"Processing batch {i}/{len(batches)} ({len(batch)} users) for cost center {cost_center_id}")
-                batch_results = self.add_users_to_cost_center(cost_center_id, batch)
-                cost_center_results.update(batch_results)
-                
-                batch_success_count = sum(1 for success in batch_results.values() if success)
-                batch_failure_count = len(batch_results) - batch_success_count
-                
-                if batch_failure_count > 0:
-                    self.logger.warning(f"Batch {i} completed: {batch_success_count} successful, {batch_failure_count} failed")
-                else:
-                    self.logger.info(f"Batch {i} completed: all {batch_success_count} users successful")
-            
-            results[cost_center_id] = cost_center_results
-            
-            # Count successes and failures for this cost center
-            cc_successful = sum(1 for success in cost_center_results.values() if success)
-            cc_failed = len(cost_center_results) - cc_successful
-            successful_users += cc_successful
-            failed_users += cc_failed
+            batch_totals[cost_center_id] = len(batches)
+            jobs.extend((cost_center_id, batch) for batch in batches)
+        
+        if jobs:
+            with ThreadPoolExecutor(max_workers=min(MAX_CONCURRENT_REQUESTS, len(jobs))) as executor:
+                futures = [
+                    (cost_center_id, executor.submit(self.add_users_to_cost_center, cost_center_id, batch))
+                    for cost_center_id, batch in jobs
+                ]
+                batches_done = Counter()
+                for cost_center_id, future in futures:
+                    batch_results = future.result()
+                    results.setdefault(cost_center_id, {}).update(batch_results)
+                    outcome_counts.update(batch_results.values())
+                    counts = cost_center_counts[cost_center_id]
+                    counts.update(batch_results.values())
+                    
+                    # Progress every 10 batches and when a cost center finishes, not per batch
+                    batches_done[cost_center_id] += 1
+                    done, total = batches_done[cost_center_id], batch_totals[cost_center_id]
+                    if done % 10 == 0 or done == total:
+                        self.logger.log(
+                            logging.WARNING if counts[False] else logging.INFO,
+                            "Cost center %s: %d/%d batches completed (%d successful, %d failed)",
+                            cost_center_id, done, total, counts[True], counts[False]
+                        )
+        
+        successful_users = outcome_counts[True]
+        failed_users = outcome_counts[False]
         
         # Log final summary
         self.logger.info(f"📊 ASSIGNMENT RESULTS: {successful_users}/{total_users} users successfully assigned")
@@ -318,26 +602,11 @@ class GitHubCopilotManager:
             "name": name
         }
         
-        # Set proper headers including API version
-        headers = {
-            "accept": "application/vnd.github+json",
-            "x-github-api-version": "2022-11-28",
-            "content-type": "application/json"
-        }
-        
         try:
-            response = self.session.post(url, json=payload, headers=headers)
-            
-            # Handle rate limiting
-            if response.status_code == 429:
-                reset_time = int(response.headers.get('X-RateLimit-Reset', time.time() + 60))
-                wait_time = reset_time - int(time.time()) + 1
-                self.logger.warning(f"Rate limit hit. Waiting {wait_time} seconds...")
-                time.sleep(wait_time)
-                return self.create_cost_center(name)
+            response = self._request("POST", url, json=payload)
             
             if response.status_code in [200, 201]:
-                response_data = response.json()
+                response_data = self._json(response)
                 cost_center_id = response_data.get('id')
                 self.logger.info(f"Successfully created cost center '{name}' with ID: {cost_center_id}")
                 return cost_center_id
@@ -404,6 +673,27 @@ class GitHubCopilotManager:
             self.logger.error(f"Error finding cost center '{name}': {str(e)}")
             return None
     
+    def _list_active_cost_centers(self) -> Optional[Dict[str, str]]:
+        """
+        List the enterprise's ACTIVE cost centers.
+        
+        Returns:
+            Dict mapping cost center name -> ID, or None if the list could not be fetched
+        """
+        url = f"{self.base_url}/enterprises/{self.enterprise_name}/settings/billing/cost-centers"
+        
+        try:
+            response_data = self._make_request(url)
+        except requests.exceptions.RequestException as e:
+            self.logger.warning(f"Could not list existing cost centers: {str(e)}")
+            return None
+        
+        active_centers = {}
+        for center in response_data.get('costCenters', []):
+            if center.get('state', 'unknown').upper() == 'ACTIVE':
+                active_centers.setdefault(center.get('name'), center.get('id'))
+        return active_centers
+    
     def ensure_cost_centers_exist(self, no_pru_name: str = "00 - No PRU overages", 
                                  pru_allowed_name: str = "01 - PRU overages allowed") -> Optional[Dict[str, str]]:
         """
@@ -420,23 +710,25 @@ class GitHubCopilotManager:
             self.logger.error("Cost center operations only available for GitHub Enterprise")
             return None
         
-        # Try to create the cost centers (will handle 409 conflicts gracefully)
-        self.logger.info(f"Ensuring cost center exists: {no_pru_name}")
-        no_pru_id = self.create_cost_center(no_pru_name)
-        if not no_pru_id:
-            self.logger.error(f"Failed to ensure cost center exists: {no_pru_name}")
-            return None
+        # List existing cost centers once; only missing ones are created (409 conflicts
+        # from a concurrent creation are still handled by create_cost_center)
+        active_centers = self._list_active_cost_centers() or {}
         
-        self.logger.info(f"Ensuring cost center exists: {pru_allowed_name}")
-        pru_allowed_id = self.create_cost_center(pru_allowed_name)
-        if not pru_allowed_id:
-            self.logger.error(f"Failed to ensure cost center exists: {pru_allowed_name}")
-            return None
+        result = {}
+        for key, name in (('no_pru_id', no_pru_name), ('pru_allowed_id', pru_allowed_name)):
+            self.logger.info(f"Ensuring cost center exists: {name}")
+            cost_center_id = active_centers.get(name)
+            if cost_center_id:
+                self.logger.info(f"Found ACTIVE cost center '{name}' with ID: {cost_center_id}")
+            else:
+                cost_center_id = self.create_cost_center(name)
+            if not cost_center_id:
+                self.logger.error(f"Failed to ensure cost center exists: {name}")
+                return None
+            result[key] = cost_center_id
         
-        result = {
-            'no_pru_id': no_pru_id,
-            'pru_allowed_id': pru_allowed_id
-        }
+        no_pru_id = result['no_pru_id']
+        pru_allowed_id = result['pru_allowed_id']
         
         self.logger.info(f"Cost centers ready - No PRU: {no_pru_id}, PRU Allowed: {pru_allowed_id}")
         return result
\ No newline at end of file
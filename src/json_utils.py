@@ -0,0 +1,31 @@
+"""
+JSON encoding helpers shared by the API client and the config/state files.
+"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # optional: fall back to the stdlib json module
+    orjson = None
+
+
+def loads(raw: bytes) -> Any:
+    """Decode JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def dumps(data: Any) -> bytes:
+    """Encode data as compact JSON bytes, using orjson when it is installed.
+
+    Dates and non-string keys are not JSON types and do not survive a round trip;
+    dates raise TypeError with either backend, while non-string keys raise with
+    orjson and are converted to strings by the stdlib.
+    """
+    if orjson is not None:
+        # Reject dates like the stdlib does instead of serializing them natively
+        return orjson.dumps(data, option=orjson.OPT_PASSTHROUGH_DATETIME)
+    return json.dumps(data, separators=(',', ':')).encode('utf-8')
@@ -2,14 +2,24 @@
 Logger setup and configuration.
 """
 
+import atexit
 import logging
 import logging.config
+import queue
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
-import yaml
+
+# Background thread writing file log records; replaced on each setup_logging() call
+_queue_listener = None
 
 
 def setup_logging(level=logging.INFO, config_file=None):
     """Setup logging configuration."""
+    global _queue_listener
+    if _queue_listener is not None:
+        # Flush and detach the previous configuration's file handlers
+        _queue_listener.stop()
+        _queue_listener = None
     
     # Create logs directory
     log_dir = Path("logs")
@@ -17,6 +27,8 @@ def setup_logging(level=logging.INFO, config_file=None):
     
     if config_file and Path(config_file).exists():
         # Load logging config from file
+        # PyYAML is only needed for a custom logging config, so import it here
+        import yaml
         with open(config_file, 'r') as f:
             config = yaml.safe_load(f)
         logging.config.dictConfig(config)
@@ -49,7 +61,8 @@ def setup_logging(level=logging.INFO, config_file=None):
                     'filename': 'logs/copilot_manager.log',
                     'maxBytes': 10485760,  # 10MB
                     'backupCount': 5,
-                    'encoding': 'utf-8'
+                    'encoding': 'utf-8',
+                    'delay': True  # don't open the file until the first record is written
                 }
             },
             'loggers': {
@@ -69,8 +82,27 @@ def setup_logging(level=logging.INFO, config_file=None):
     # Set the console handler level based on the parameter
     root_logger = logging.getLogger()
     for handler in root_logger.handlers:
-        if isinstance(handler, logging.StreamHandler) and handler.stream.name == '<stdout>':
+        # File handlers are StreamHandlers too, with no stream until delayed opening happens
+        if isinstance(handler, logging.StreamHandler) and getattr(handler.stream, 'name', None) == '<stdout>':
             handler.setLevel(level)
+    
+    # Hand file writes to a background thread so API worker threads never wait on disk I/O;
+    # console output stays synchronous so it keeps its order relative to print()
+    file_handlers = [handler for handler in root_logger.handlers if isinstance(handler, logging.FileHandler)]
+    if file_handlers:
+        log_queue = queue.Queue(-1)
+        for handler in file_handlers:
+            root_logger.removeHandler(handler)
+        root_logger.addHandler(QueueHandler(log_queue))
+        _queue_listener = QueueListener(log_queue, *file_handlers, respect_handler_level=True)
+        _queue_listener.start()
+
+
+@atexit.register
+def _stop_queue_listener():
+    """Drain queued file log records before the interpreter exits."""
+    if _queue_listener is not None:
+        _queue_listener.stop()
 
 
 def get_logger(name):